@@ -1,6 +1,12 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+# the convolution helpers are shared with online 2/practice problems
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "online 2", "practice problems"))
+from convolution_utils import convolve_arrays, nonzero_support
+
 class Signal:
     def __init__(self, INF):
         self.INF=INF
@@ -42,6 +48,78 @@ class Signal:
         plt.show()
 
 
+class PartitionedConvolver:
+    """
+    Streaming convolution with a long impulse response (uniformly partitioned
+    overlap-save). h is cut into P = ceil(len(h)/B) partitions of B taps, each
+    transformed once with a 2B-point FFT. Every block of B input samples costs one
+    forward and one inverse 2B-point FFT plus a multiply-accumulate of the P spectra
+    in the frequency-domain delay line, and yields B output samples (one block of
+    latency). The FFT work per sample does not grow with len(h); only the P-term
+    spectral sum does.
+    """
+    def __init__(self, h, block_size=256):
+        h = np.asarray(h, dtype=np.float64)
+        self.B = int(block_size)
+        self.h_len = len(h)
+        self.P = max(1, -(-len(h) // self.B))
+        taps = np.zeros(self.P * self.B)
+        taps[:len(h)] = h
+        self.H = np.fft.rfft(taps.reshape(self.P, self.B), 2 * self.B, axis=1)   # (P, B+1)
+        self.reset()
+
+    def reset(self):
+        self._window = np.zeros(2 * self.B)          # previous block + current block
+        self._fdl = np.zeros_like(self.H)            # frequency-domain delay line (ring)
+        self._head = 0
+
+    def process_block(self, block):
+        """Exactly B new input samples in, the next B output samples out."""
+        B, P = self.B, self.P
+        block = np.asarray(block, dtype=np.float64)
+        if len(block) != B:
+            raise ValueError(f"process_block expects {B} samples, got {len(block)}")
+        self._window[:B] = self._window[B:]
+        self._window[B:] = block
+
+        # newest spectrum at _head; _fdl[(_head + p) % P] is the block from p blocks ago
+        self._head = (self._head - 1) % P
+        self._fdl[self._head] = np.fft.rfft(self._window)
+        k = P - self._head
+        Y = np.einsum("pk,pk->k", self._fdl[self._head:], self.H[:k])
+        if self._head:
+            Y += np.einsum("pk,pk->k", self._fdl[:self._head], self.H[k:])
+        return np.fft.irfft(Y, 2 * B)[B:]
+
+    def stream(self, blocks):
+        """
+        blocks: iterable of 1-D arrays of any length. Yields output as soon as whole
+        B-sample blocks are available; after the input ends the tail of h is flushed,
+        so len(x) + len(h) - 1 samples are produced in total.
+        """
+        B = self.B
+        pending = np.zeros(0)
+        total = emitted = 0
+        for block in blocks:
+            block = np.asarray(block, dtype=np.float64).ravel()
+            pending = np.concatenate([pending, block])
+            total += len(block)
+            n = len(pending) // B
+            if n:
+                out = np.concatenate([self.process_block(pending[i * B:(i + 1) * B]) for i in range(n)])
+                pending = pending[n * B:]
+                emitted += len(out)
+                yield out
+        if total == 0:
+            return
+        remaining = total + self.h_len - 1 - emitted
+        tail = np.zeros(-(-max(remaining, 0) // B) * B)
+        tail[:len(pending)] = pending
+        if len(tail):
+            out = np.concatenate([self.process_block(tail[i:i + B]) for i in range(0, len(tail), B)])
+            yield out[:remaining]
+
+
 class LTI_System:
     def __init__(self, impulse_response: Signal):
         self.h=impulse_response
@@ -63,14 +141,33 @@ class LTI_System:
         return impulses, coefficients
     
     def output(self, input_signal:Signal):
-        impulses, coefficients = self.linear_combination_of_impulses(input_signal)
+        # Same sum as adding coeff*h.shift(k) for every impulse of the input,
+        # y[t] = sum_k x[k] h[t-k], done as one convolution of the value arrays.
+        # Only the non-zero spans are convolved, so the ±INF padding costs nothing.
         y = Signal(self.INF)
-        for delta_k, coeff in zip(impulses, coefficients):
-            shifted_h = self.h.shift(delta_k.n[np.argmax(delta_k.values)])
-            y=y.add(shifted_h.multiply(coeff))
+        xi, xs = nonzero_support(input_signal.values)
+        hi, hs = nonzero_support(self.h.values)
+        if len(xs) == 0 or len(hs) == 0:
+            return y
+        full = convolve_arrays(xs, hs)
 
+        # full[i] is time t0 + i; keep what falls inside [-INF, INF]
+        t0 = (xi - input_signal.INF) + (hi - self.INF)
+        j0 = t0 + self.INF
+        lo, up = max(j0, 0), min(j0 + len(full), len(y.values))
+        if lo < up:
+            y.values[lo:up] = full[lo - j0:up - j0]
         return y
 
+    def stream_output(self, blocks, block_size=256):
+        """
+        Streaming output for inputs that never fit a ±INF window. Returns
+        (h_start, stream): stream convolves the input blocks with the non-zero span of h,
+        which starts at time h_start, so sample j of the stream is y[x_start + h_start + j].
+        """
+        hi, hs = nonzero_support(self.h.values)
+        return hi - self.INF, PartitionedConvolver(hs, block_size).stream(blocks)
+
 if __name__ == "__main__":
     INF = 10
 
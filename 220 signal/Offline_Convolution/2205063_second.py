@@ -1,6 +1,92 @@
+import io
+import os
+import sys
+import tempfile
 import numpy as np
 import matplotlib.pyplot as plt
 
+# the convolution helpers are shared with online 2/practice problems
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "online 2", "practice problems"))
+from convolution_utils import convolve_arrays, nonzero_support, StreamingSmoother
+
+# Characters of sample text parsed per chunk by the input_signal.txt readers.
+READ_CHUNK_CHARS = 1 << 20
+
+def _parse_samples(f, chunk_chars=READ_CHUNK_CHARS):
+    """Yield float64 arrays parsed from the whitespace-separated samples left in f, one per text chunk."""
+    tail = ""
+    while True:
+        text = f.read(chunk_chars)
+        if not text:
+            break
+        text = tail + text
+        tokens = text.split()
+        # a chunk that does not end in whitespace may have cut its last number in two
+        tail = tokens.pop() if tokens and not text[-1].isspace() else ""
+        if tokens:
+            yield np.array(tokens, dtype=np.float64)
+    if tail:
+        yield np.array([tail], dtype=np.float64)
+
+def load_signal_file(filename, cache=True):
+    """
+    (n_start, values) from an input_signal.txt style file: a "n_start n_end" header,
+    then the samples for n_start..n_end. The text is parsed in chunks straight into
+    a float64 buffer. With cache=True the samples are also saved next to the file as
+    <filename>.npy, and later calls memory-map that file (read-only) while it is
+    newer than the text.
+    """
+    with open(filename, "r") as f:
+        n_start, n_end = map(int, f.readline().split())
+        n = n_end - n_start + 1
+        sidecar = filename + ".npy"
+        if cache and os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(filename):
+            values = np.load(sidecar, mmap_mode="r")
+            if len(values) == n:
+                return n_start, values
+
+        values = np.empty(n)
+        filled = 0
+        for chunk in _parse_samples(f):
+            m = min(len(chunk), n - filled)
+            values[filled:filled + m] = chunk[:m]
+            filled += m
+    if filled < n:
+        raise ValueError(f"{filename}: header promises {n} samples, found {filled}")
+
+    if cache:
+        try:
+            np.save(sidecar, values)
+        except OSError:
+            pass
+    return n_start, values
+
+def iter_signal_blocks(filename, block_size=4096):
+    """
+    Yield (start_time, block) pairs of at most block_size samples from an input_signal.txt
+    style file without holding the whole signal. Uses the .npy cache from
+    load_signal_file when it is current, and parses the text chunk by chunk otherwise.
+    """
+    sidecar = filename + ".npy"
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(filename):
+        n_start, values = load_signal_file(filename)
+        for i in range(0, len(values), block_size):
+            yield n_start + i, np.asarray(values[i:i + block_size])
+        return
+
+    with open(filename, "r") as f:
+        n_start, n_end = map(int, f.readline().split())
+        remaining = n_end - n_start + 1
+        t, pending = n_start, np.zeros(0)
+        for chunk in _parse_samples(f):
+            pending = np.concatenate([pending, chunk[:remaining]])
+            remaining -= min(len(chunk), remaining)
+            while len(pending) >= block_size:
+                yield t, pending[:block_size]
+                t, pending = t + block_size, pending[block_size:]
+        if len(pending):
+            yield t, pending
+
 class Signal:
     def __init__(self, INF):
         self.INF=INF
@@ -42,6 +128,91 @@ class Signal:
         plt.show()
 
 
+class SupportSignal:
+    """
+    Signal stored over its actual support only: values[i] is x[start + i].
+    There is no ±INF window, so nothing is truncated or padded; shift is O(1)
+    offset arithmetic and add is one aligned vector add.
+    """
+    def __init__(self, start=0, values=()):
+        self.start = int(start)
+        self.values = np.asarray(values, dtype=np.float64)
+
+    @property
+    def end(self):
+        return self.start + len(self.values) - 1
+
+    @property
+    def n(self):
+        return np.arange(self.start, self.end + 1)
+
+    @classmethod
+    def from_signal(cls, sig: Signal):
+        i, vals = nonzero_support(sig.values)
+        return cls(i - sig.INF, vals.copy())
+
+    def to_signal(self, INF):
+        sig = Signal(INF)
+        j0 = self.start + INF
+        lo, up = max(j0, 0), min(j0 + len(self.values), len(sig.values))
+        if lo < up:
+            sig.values[lo:up] = self.values[lo - j0:up - j0]
+        return sig
+
+    def get_value_at_time(self, t):
+        if self.start <= t <= self.end:
+            return self.values[t - self.start]
+        return 0.0
+
+    def set_value_at_time(self, t, value):
+        if len(self.values) == 0:
+            self.start, self.values = t, np.array([value], dtype=np.float64)
+            return
+        if not self.values.flags.writeable:
+            self.values = self.values.copy()   # values shared with a shift()ed signal
+        if t < self.start:
+            self.values = np.concatenate([np.zeros(self.start - t), self.values])
+            self.start = t
+        elif t > self.end:
+            self.values = np.concatenate([self.values, np.zeros(t - self.end)])
+        self.values[t - self.start] = value
+
+    def shift(self, k):
+        # shares the sample buffer (read-only view; set_value_at_time copies on write)
+        view = self.values.view()
+        view.setflags(write=False)
+        return SupportSignal(self.start + k, view)
+
+    def add(self, other):
+        if len(other.values) == 0:
+            return SupportSignal(self.start, self.values.copy())
+        if len(self.values) == 0:
+            return SupportSignal(other.start, other.values.copy())
+        lo, hi = min(self.start, other.start), max(self.end, other.end)
+        out = np.zeros(hi - lo + 1)
+        out[self.start - lo:self.end - lo + 1] = self.values
+        out[other.start - lo:other.end - lo + 1] += other.values
+        return SupportSignal(lo, out)
+
+    def multiply(self, scalar):
+        return SupportSignal(self.start, scalar * self.values)
+
+    def convolve(self, other):
+        # support of the output is exactly [sx + sh, ex + eh]
+        if len(self.values) == 0 or len(other.values) == 0:
+            return SupportSignal(self.start + other.start, [])
+        return SupportSignal(self.start + other.start, convolve_arrays(self.values, other.values))
+
+    def plot(self, title="Discrete Signal"):
+        plt.figure()
+        plt.stem(self.n, self.values)
+        plt.title(title)
+        plt.xlabel("n")
+        plt.ylabel("amplitude")
+        plt.grid(True)
+        plt.show()
+
+
 class LTI_System:
     def __init__(self, impulse_response: Signal):
         self.h=impulse_response
@@ -63,33 +234,57 @@ class LTI_System:
         return impulses, coefficients
     
     def output(self, input_signal:Signal):
-        impulses, coefficients = self.linear_combination_of_impulses(input_signal)
+        if isinstance(input_signal, SupportSignal):
+            # exact, untruncated output over [sx + sh, ex + eh]
+            return input_signal.convolve(SupportSignal.from_signal(self.h))
+        # Same sum as adding coeff*h.shift(k) for every impulse of the input,
+        # y[t] = sum_k x[k] h[t-k], done as one convolution of the value arrays.
+        # Only the non-zero spans are convolved, so the ±INF padding costs nothing.
         y = Signal(self.INF)
-        for delta_k, coeff in zip(impulses, coefficients):
-            shifted_h = self.h.shift(delta_k.n[np.argmax(delta_k.values)])
-            y=y.add(shifted_h.multiply(coeff))
+        xi, xs = nonzero_support(input_signal.values)
+        hi, hs = nonzero_support(self.h.values)
+        if len(xs) == 0 or len(hs) == 0:
+            return y
+        full = convolve_arrays(xs, hs)
 
+        # full[i] is time t0 + i; keep what falls inside [-INF, INF]
+        t0 = (xi - input_signal.INF) + (hi - self.INF)
+        j0 = t0 + self.INF
+        lo, up = max(j0, 0), min(j0 + len(full), len(y.values))
+        if lo < up:
+            y.values[lo:up] = full[lo - j0:up - j0]
         return y
 
 if __name__ == "__main__":
     filename = "input_signal.txt"
 
-    with open(filename, "r") as f:
-        n_start, n_end = map(int, f.readline().split())
-        data = list(map(float, f.readline().split()))
-    
-    INF = max(abs(n_start), abs(n_end))+10
-    x = Signal(INF)
+    n_start, data = load_signal_file(filename)
 
-    for i, val in enumerate(data):
-        x.set_value_at_time(n_start+i, val)
-    
+    # No INF padding needed: the input keeps only its real support.
+    x = SupportSignal(n_start, data)
     x.plot("Noisy Input Signal x(n)")
-    h = Signal(INF)
+
+    h = Signal(2)
     for n in range(-2, 3):
         h.set_value_at_time(n, 1/5)
     
     h.plot("Impulse Response h(n)---5 points moving average filter")
     system = LTI_System(h)
+    # a SupportSignal input gives the exact output over its whole support
     y = system.output(x)
-    y.plot("Smoothed Output Signal y(n)")
\ No newline at end of file
+    y.plot("Smoothed Output Signal y(n)")
+
+    # Regression: trailing newlines and chunk cuts inside whitespace add no samples
+    chunks = list(_parse_samples(io.StringIO("1 2  \n 3\t4\n\n5\n"), chunk_chars=3))
+    print("Chunked parse matches:", np.array_equal(np.concatenate(chunks), [1, 2, 3, 4, 5]))
+    with tempfile.TemporaryDirectory() as tmp:
+        short_file = os.path.join(tmp, "short.txt")
+        with open(short_file, "w") as f:
+            f.write("0 5\n1 2 3 4 5\n")
+        try:
+            load_signal_file(short_file, cache=False)
+            print("Short file rejected: False")
+        except ValueError:
+            print("Short file rejected: True")
+        blocks = list(iter_signal_blocks(short_file, block_size=4))
+        print("Short file blocks:", [(t, b.tolist()) for t, b in blocks])
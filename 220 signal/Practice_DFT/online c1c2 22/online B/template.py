@@ -1,27 +1,206 @@
 import numpy as np
 
 
-def fft(a):
-    N = len(a)
-    if N == 1:
-        return a
-    even = fft(a[::2])
-    odd = fft(a[1::2])
-    k = np.arange(N // 2)
-    tw = np.exp(-2j * np.pi * k / N) * odd
-    return np.concatenate([even + tw, even - tw])
-
-
-def ifft(a):
-    N = len(a)
-    return np.conjugate(fft(np.conjugate(a))) / N
-
-
-def next_power_of_2(n):
-    p = 1
-    while p < n:
-        p <<= 1
-    return p
+# NTT-friendly primes p = c * 2^k + 1, all below 2^31 so a product of two residues
+# fits in int64. An NTT of length N mod p needs 2^k >= N.
+NTT_PRIMES = (2013265921, 1811939329, 469762049, 998244353, 167772161)
+
+# Below this many terms of the shorter operand, exact np.convolve beats the NTT.
+NTT_DIRECT_THRESHOLD = 64
+
+_NTT_ROOTS = {}
+
+
+def _two_adic(p):
+    return ((p - 1) & -(p - 1)).bit_length() - 1
+
+
+def _primitive_root(p):
+    m, factors, f = p - 1, set(), 2
+    while f * f <= m:
+        while m % f == 0:
+            factors.add(f)
+            m //= f
+        f += 1
+    if m > 1:
+        factors.add(m)
+    g = 2
+    while any(pow(g, (p - 1) // q, p) == 1 for q in factors):
+        g += 1
+    return g
+
+
+def ntt_roots(p, N):
+    """
+    Per-stage twiddle arrays for a length-N NTT mod p, cached per (p, N). Entry s of
+    each list holds w^j for j < h, where w is a primitive 2h-th root of unity and
+    h = N/2, N/4, ..., 1. Forward uses w and inverse uses w^-1.
+    """
+    key = (p, N)
+    roots = _NTT_ROOTS.get(key)
+    if roots is None:
+        g = _primitive_root(p)
+        fwd, inv = [], []
+        h = N // 2
+        while h >= 1:
+            w = pow(g, (p - 1) // (2 * h), p)
+            fwd.append(_power_table(w, h, p))
+            inv.append(_power_table(pow(w, p - 2, p), h, p))
+            h //= 2
+        roots = _NTT_ROOTS[key] = (fwd, inv, pow(N, p - 2, p))
+    return roots
+
+
+def _power_table(w, h, p):
+    # w^0 .. w^(h-1) mod p by doubling: each step extends the table with w^len * table
+    t = np.ones(h, dtype=np.int64)
+    n, wn = 1, w
+    while n < h:
+        m = min(n, h - n)
+        t[n:n + m] = t[:m] * wn % p
+        n += m
+        wn = wn * wn % p
+    return t
+
+
+def ntt(a, p, inverse=False):
+    """
+    Length-N NTT mod p over the last axis of int64 residues a, where N is a power of two.
+    Forward is decimation in frequency (natural order in, bit-reversed out). Inverse is
+    decimation in time (bit-reversed in, natural out). A pointwise product of two forward
+    transforms can therefore be inverted without any permutation.
+    """
+    N = a.shape[-1]
+    fwd, inv, n_inv = ntt_roots(p, N)
+    batch = a.shape[:-1]
+    x = a.copy()
+    if not inverse:
+        h = N // 2
+        for w in fwd:
+            v = x.reshape(batch + (N // (2 * h), 2, h))
+            lo, hi = v[..., 0, :], v[..., 1, :]
+            s = (lo + hi) % p
+            d = (lo - hi) % p * w % p
+            v[..., 0, :], v[..., 1, :] = s, d
+            h //= 2
+        return x
+    h = 1
+    for w in reversed(inv):
+        v = x.reshape(batch + (N // (2 * h), 2, h))
+        lo, hi = v[..., 0, :], v[..., 1, :] * w % p
+        s = (lo + hi) % p
+        d = (lo - hi) % p
+        v[..., 0, :], v[..., 1, :] = s, d
+        h *= 2
+    return x * n_inv % p
+
+
+def _int_array(a):
+    arr = np.asarray(a)
+    if arr.dtype.kind in "iub":
+        return arr.astype(np.int64)
+    if arr.dtype.kind == "f":
+        if not np.all(arr == np.round(arr)):
+            raise ValueError("NTT multiplication needs integer coefficients")
+        return arr.astype(np.int64)
+    if arr.dtype.kind == "O":
+        return arr
+    raise ValueError("NTT multiplication needs integer coefficients")
+
+
+def _max_abs(arr):
+    if arr.size == 0:
+        return 0
+    if arr.dtype == object:
+        return max(abs(int(v)) for v in arr.ravel())
+    return int(np.abs(arr).max())
+
+
+def ntt_multiply_batch(A, B):
+    """
+    Exact integer products of the rows of A (k x n) and B (k x m), returned k x (n+m-1).
+    The coefficient bound min(n, m) * max|A| * max|B| picks how many NTT_PRIMES to use.
+    Residues are combined with Garner's CRT. The result is int64 when two primes suffice,
+    and an object array of Python ints for larger coefficients. Each row is padded to a
+    power of two, and every row of a prime's batch shares one cached set of roots.
+    """
+    A, B = np.atleast_2d(_int_array(A)), np.atleast_2d(_int_array(B))
+    if A.shape[0] != B.shape[0]:
+        raise ValueError("A and B need the same number of rows")
+    k, n = A.shape
+    m = B.shape[1]
+    if n == 0 or m == 0:
+        return np.zeros((k, 0), dtype=np.int64)
+    L = n + m - 1
+    bound = min(n, m) * _max_abs(A) * _max_abs(B)
+    if bound == 0:
+        # an all-zero operand: no prime is needed and every coefficient is 0
+        return np.zeros((k, L), dtype=np.int64)
+
+    if min(n, m) <= NTT_DIRECT_THRESHOLD and bound < 2 ** 62 and A.dtype != object and B.dtype != object:
+        return np.stack([np.convolve(a, b) for a, b in zip(A, B)])
+
+    N = 1 << (L - 1).bit_length()
+    primes, M = [], 1
+    for p in NTT_PRIMES:
+        if M > 2 * bound:
+            break
+        if _two_adic(p) >= N.bit_length() - 1:
+            primes.append(p)
+            M *= p
+    if M <= 2 * bound:
+        raise ValueError("coefficients too large for the available NTT primes")
+
+    residues = []
+    for p in primes:
+        fa = np.zeros((k, N), dtype=np.int64)
+        fb = np.zeros((k, N), dtype=np.int64)
+        fa[:, :n] = np.mod(A, p).astype(np.int64)
+        fb[:, :m] = np.mod(B, p).astype(np.int64)
+        residues.append(ntt(ntt(fa, p) * ntt(fb, p) % p, p, inverse=True)[:, :L])
+
+    # Garner: value = d0 + d1*p0 + d2*p0*p1 + ..., each digit d_i < p_i
+    digits = []
+    for i, (p, r) in enumerate(zip(primes, residues)):
+        t = r
+        for j in range(i):
+            t = (t - digits[j]) % p * pow(primes[j], p - 2, p) % p
+        digits.append(t)
+    if len(primes) <= 2:
+        value = digits[0].copy()
+        if len(primes) == 2:
+            value += digits[1] * primes[0]
+    else:
+        value = digits[0].astype(object)
+        radix = 1
+        for p, d in zip(primes[:-1], digits[1:]):
+            radix *= p
+            value = value + d.astype(object) * radix
+    return np.where(value > M // 2, value - M, value)
+
+
+def ntt_multiply(a, b):
+    """Exact product of two integer polynomials (ascending coefficients)."""
+    return ntt_multiply_batch([a], [b])[0]
+
+
+def _is_integral(arr):
+    if arr.dtype.kind in "iubO":
+        return True
+    if arr.dtype.kind == "c":
+        return False
+    return bool(np.all(arr == np.round(arr)))
+
+
+def _rounded_product(a, b):
+    """Floating-point product of two coefficient arrays, rounded to the nearest integers."""
+    L = len(a) + len(b) - 1
+    if min(len(a), len(b)) <= NTT_DIRECT_THRESHOLD:
+        r = np.convolve(a, b)
+    else:
+        N = 1 << (L - 1).bit_length()
+        r = np.fft.ifft(np.fft.fft(a, N) * np.fft.fft(b, N))[:L]
+    return np.round(np.real(r)).astype(int)
 
 
 def weighted_polynomial_multiply(P, Q, W):
@@ -29,26 +208,13 @@ def weighted_polynomial_multiply(P, Q, W):
     # A[i] = wi * pi
     A = [p * w for p, w in zip(P, W)]
 
-    n = len(A)
-    m = len(Q)
-
-    size = next_power_of_2(n + m - 1)
-
-    A_pad = np.zeros(size, dtype=np.complex128)
-    Q_pad = np.zeros(size, dtype=np.complex128)
-
-    A_pad[:n] = A
-    Q_pad[:m] = Q
-
-    FA = fft(A_pad)
-    FQ = fft(Q_pad)
-
-    FR = FA * FQ
-
-    result = np.real(ifft(FR))
-    result = np.round(result).astype(int)
+    A_arr, Q_arr = np.asarray(A), np.asarray(Q)
+    if not (_is_integral(A_arr) and _is_integral(Q_arr)):
+        # Non-integer coefficients: product in floating point, rounded as before
+        return [int(c) for c in _rounded_product(A_arr, Q_arr)]
 
-    return result[:n + m - 1].tolist()
+    # Exact in modular arithmetic: no complex FFT round-off to np.round away
+    return [int(c) for c in ntt_multiply(A, Q)]
 
 
 if __name__ == "__main__":
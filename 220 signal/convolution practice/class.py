@@ -1,22 +1,181 @@
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Below this many samples np.convolve (direct) beats the FFT.
+FFT_CONV_THRESHOLD = 64
+
+def convolve_arrays(x, h):
+    """Full linear convolution of two 1-D arrays: direct for short inputs, FFT otherwise."""
+    if min(len(x), len(h)) <= FFT_CONV_THRESHOLD:
+        return np.convolve(x, h)
+    L = len(x) + len(h) - 1
+    nfft = 1 << (L - 1).bit_length()
+    return np.fft.irfft(np.fft.rfft(x, nfft) * np.fft.rfft(h, nfft), nfft)[:L]
+
+
+# ---------------------------------------------------------------------------
+# Expression graph behind ContinuousSignal.
+# shift/add/multiply build small nodes instead of nested lambdas, simplified as
+# they are built:
+#   - shifts are pushed down to the leaves and merged: f(t - a - b)
+#   - constant factors are folded into one coefficient per term / product
+#   - nested sums are flattened; equal terms (same leaf, same shift) are merged
+#   - constants are folded (c1 + c2, c1 * c2, 0 * x)
+# A whole tree is then evaluated in one pass, each distinct leaf called once.
+# ---------------------------------------------------------------------------
+class _Leaf:
+    def __init__(self, f, shift=0.0):
+        self.f, self.shift = f, float(shift)
+        self.key = ("leaf", id(f), self.shift)
+
+class _Const:
+    def __init__(self, value):
+        self.value = value
+        self.key = ("const", value)
+
+class _Sum:
+    # const + sum(coef * expr); terms is a tuple of (coef, expr)
+    def __init__(self, terms, const=0.0):
+        self.terms, self.const = tuple(terms), const
+        self.key = ("sum", const, tuple((c, e.key) for c, e in self.terms))
+
+class _Prod:
+    # coef * prod(factors)
+    def __init__(self, factors, coef=1.0):
+        self.factors, self.coef = tuple(factors), coef
+        self.key = ("prod", coef, tuple(e.key for e in self.factors))
+
+def _shift(e, s):
+    if s == 0 or isinstance(e, _Const):
+        return e
+    if isinstance(e, _Leaf):
+        return _Leaf(e.f, e.shift + s)
+    if isinstance(e, _Sum):
+        return _Sum([(c, _shift(x, s)) for c, x in e.terms], e.const)
+    return _Prod([_shift(x, s) for x in e.factors], e.coef)
+
+def _as_terms(e):
+    # (terms, const) of e viewed as a sum; product coefficients move into the term
+    if isinstance(e, _Const):
+        return [], e.value
+    if isinstance(e, _Sum):
+        return list(e.terms), e.const
+    if isinstance(e, _Prod) and e.coef != 1.0:
+        return [(e.coef, _Prod(e.factors))], 0.0
+    return [(1.0, e)], 0.0
+
+def _make_sum(terms, const):
+    merged = OrderedDict()
+    for c, e in terms:
+        k = e.key
+        merged[k] = (merged[k][0] + c, e) if k in merged else (c, e)
+    terms = [(c, e) for c, e in merged.values() if c != 0]
+    if not terms:
+        return _Const(const)
+    if len(terms) == 1 and const == 0:
+        c, e = terms[0]
+        return e if c == 1.0 else _scale(e, c)
+    return _Sum(terms, const)
+
+def _add(a, b):
+    ta, ca = _as_terms(a)
+    tb, cb = _as_terms(b)
+    return _make_sum(ta + tb, ca + cb)
+
+def _scale(e, k):
+    if k == 0:
+        return _Const(0.0)
+    if k == 1:
+        return e
+    if isinstance(e, _Const):
+        return _Const(k * e.value)
+    if isinstance(e, _Sum):
+        return _Sum([(k * c, x) for c, x in e.terms], k * e.const)
+    if isinstance(e, _Prod):
+        return _Prod(e.factors, k * e.coef)
+    return _Sum([(k, e)])
+
+def _mul(a, b):
+    if isinstance(a, _Const):
+        return _scale(b, a.value)
+    if isinstance(b, _Const):
+        return _scale(a, b.value)
+    fa, ka = (a.factors, a.coef) if isinstance(a, _Prod) else ((a,), 1.0)
+    fb, kb = (b.factors, b.coef) if isinstance(b, _Prod) else ((b,), 1.0)
+    return _Prod(fa + fb, ka * kb)
+
+def _evaluate(e, t, memo):
+    v = memo.get(e.key)
+    if v is not None:
+        return v
+    if isinstance(e, _Leaf):
+        v = e.f(t - e.shift) if e.shift else e.f(t)
+    elif isinstance(e, _Const):
+        v = e.value
+    elif isinstance(e, _Sum):
+        v = e.const
+        for c, x in e.terms:
+            v = v + c * _evaluate(x, t, memo)
+    else:
+        v = e.coef
+        for x in e.factors:
+            v = v * _evaluate(x, t, memo)
+    memo[e.key] = v
+    return v
+
 
 class ContinuousSignal:
+    CACHE_SIZE = 8      # t-grids remembered per signal
+
     def __init__(self, func):
-        self.func = func
+        if isinstance(func, (_Leaf, _Const, _Sum, _Prod)):
+            self.expr = func
+        elif isinstance(getattr(func, "__self__", None), ContinuousSignal):
+            self.expr = func.__self__.expr       # ContinuousSignal(other.func)
+        else:
+            self.expr = _Leaf(func)
+        self._cache = OrderedDict()
+
+    @classmethod
+    def constant(cls, value):
+        return cls(_Const(value))
+
+    @property
+    def func(self):
+        return self.__call__
+
+    def __call__(self, t):
+        # Whole expression in one pass; results for array grids are cached
+        # (read-only) so re-plotting or re-convolving on the same t skips the
+        # evaluation. Callers get a fresh writable copy, never the cached array.
+        if not isinstance(t, np.ndarray) or t.ndim == 0:
+            return _evaluate(self.expr, t, {})
+        key = (t.shape, t.dtype.str, hashlib.blake2b(np.ascontiguousarray(t), digest_size=16).digest())
+        y = self._cache.get(key)
+        if y is None:
+            y = np.array(np.broadcast_to(_evaluate(self.expr, t, {}), t.shape))
+            y.setflags(write=False)
+            self._cache[key] = y
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return y.copy()
 
     def shift(self, shift_val):
-        return ContinuousSignal(lambda t: self.func(t - shift_val))
+        return ContinuousSignal(_shift(self.expr, shift_val))
 
     def add(self, other):
-        return ContinuousSignal(lambda t: self.func(t) + other.func(t))
+        return ContinuousSignal(_add(self.expr, other.expr))
 
     def multiply(self, other):
-        return ContinuousSignal(lambda t: self.func(t) * other.func(t))
+        return ContinuousSignal(_mul(self.expr, other.expr))
 
     def multiply_const_factor(self, scalar):
-        return ContinuousSignal(lambda t: scalar * self.func(t))
+        return ContinuousSignal(_scale(self.expr, scalar))
 
     def plot(self, t_min, t_max, num_points, title="", ax=None, label=None, color=None):
         t = np.linspace(t_min, t_max, num_points)
@@ -31,6 +190,8 @@ class ContinuousSignal:
             ax.grid(True)
 
 class LTI_Continuous:
+    APPROX_BLOCK = 1 << 18    # H entries evaluated at once off the tk lattice
+
     def __init__(self, impulse_response):
         self.impulse_response = impulse_response
 
@@ -49,8 +210,47 @@ class LTI_Continuous:
             
         return impulses, coefficients
 
-    def output_approx(self, input_signal, delta):
-        raise NotImplementedError("Not required for this practice.")
+    def output_approx(self, input_signal, delta, t_grid, t_range=(-3, 3)):
+        """
+        Riemann-sum convolution y(t) ~ sum_k x(tk) * delta * h(t - tk), tk = t_range[0], +delta, ...
+        (the same impulses as linear_combination_of_impulses, each replaced by its
+        response). x and h are sampled once as arrays instead of one closure per tk.
+
+        If t_grid is uniform with step delta and lies on the tk lattice, h is sampled
+        once on that lattice and y is one discrete convolution (FFT for long grids);
+        otherwise y = H @ c with H[i, k] = h(t_i - tk), built a block of t_grid rows at
+        a time (APPROX_BLOCK entries) so memory does not grow with len(t_grid) / delta.
+        delta may be an array: the result is then stacked as (len(delta), len(t_grid)).
+        """
+        t_grid = np.asarray(t_grid, dtype=np.float64)
+        if np.ndim(delta) > 0:
+            return np.stack([self.output_approx(input_signal, d, t_grid, t_range) for d in delta])
+
+        delta = float(delta)
+        tk = np.arange(t_range[0], t_range[1], delta)
+        c = np.asarray(input_signal.func(tk), dtype=np.float64) * delta
+        h = self.impulse_response.func
+
+        steps = np.diff(t_grid)
+        offset = (t_grid[0] - tk[0]) / delta
+        on_lattice = (len(t_grid) > 1 and np.allclose(steps, delta)
+                      and np.isclose(offset, np.round(offset)))
+        if on_lattice:
+            # t_i - tk = (i0 + i - k) * delta: sample h once for every lag that occurs
+            i0 = int(np.round(offset))
+            lags = np.arange(i0 - (len(tk) - 1), i0 + len(t_grid))
+            h_lag = np.asarray(h(lags * delta), dtype=np.float64) * np.ones(len(lags))
+            # y_i = sum_k c_k h_lag[i - k + len(tk) - 1]
+            full = convolve_arrays(c, h_lag)
+            return full[len(tk) - 1:len(tk) - 1 + len(t_grid)]
+
+        rows = max(1, self.APPROX_BLOCK // max(len(tk), 1))
+        y = np.empty(len(t_grid))
+        for i in range(0, len(t_grid), rows):
+            ti = t_grid[i:i + rows]
+            H = np.asarray(h(ti[:, None] - tk[None, :]), dtype=np.float64)
+            y[i:i + rows] = H @ c
+        return y
 
 def main():
     import os
@@ -82,17 +282,14 @@ def main():
     fig, axes = plt.subplots(5, 3, figsize=(12, 15), constrained_layout=True)
     axes = axes.flatten()
     
-    reconstructed_func = lambda t: 0
-    reconstructed_signal = ContinuousSignal(reconstructed_func)
+    reconstructed_signal = ContinuousSignal.constant(0.0)
 
     # Plot first 12 components
     for i in range(12):
         comp_signal = impulses[i].multiply_const_factor(coeffs[i])
         comp_signal.plot(-T, T, 500, ax=axes[i], title=f"Component k={i}")
-        # Build reconstruction
-        old_func = reconstructed_signal.func
-        new_comp_func = comp_signal.func
-        reconstructed_signal = ContinuousSignal(lambda t, f1=old_func, f2=new_comp_func: f1(t) + f2(t))
+        # Build reconstruction (flattened into one weighted sum, not nested closures)
+        reconstructed_signal = reconstructed_signal.add(comp_signal)
 
     # Plot final reconstruction in the 13th slot
     reconstructed_signal.plot(-T, T, 1000, ax=axes[12], title="Reconstructed Signal")
@@ -123,6 +320,19 @@ def main():
 
     plt.tight_layout()
     plt.savefig('convolution practice/figure3.png')
+
+    # --- Figure 4: Output approximation vs exact y(t) = (1 - e^-t) u(t) ---
+    t_space = np.arange(-T, T, 0.01)
+    y_approx = lti_system.output_approx(x, deltas, t_space)
+    y_exact = np.where(t_space >= 0, 1 - np.exp(-t_space), 0)
+    plt.figure(figsize=(8, 4))
+    plt.plot(t_space, y_exact, label="Exact y(t)", linewidth=2)
+    for d, y_d in zip(deltas, y_approx):
+        plt.plot(t_space, y_d, '--', label=f"$\\Delta$={d}")
+    plt.title("Figure 4: Output approximation y(t)")
+    plt.legend()
+    plt.grid(True)
+    plt.savefig('convolution practice/figure4.png')
     plt.show()
 
 if __name__ == "__main__":
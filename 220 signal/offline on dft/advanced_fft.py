@@ -13,22 +13,27 @@ class ArbitraryFFTAnalyzer:
         self.radix2 = FastFourierTransform()
 
     def compute_dft(self, signal: DiscreteSignal):
-        x = signal.data
+        return self._transform(signal.data)
+
+    def compute_idft(self, spectrum, real_output=False):
+        # native inverse: conjugate twiddles everywhere, 1/N folded into the last stage
+        spectrum = np.asarray(spectrum, dtype=np.complex128)
+        N = len(spectrum)
+        x = self._transform(spectrum, inverse=True, scale=1.0 / N)
+        return np.real(x) if real_output else x
+
+    def _transform(self, x, inverse=False, scale=1.0):
         N = len(x)
 
         if self._is_power_of_two(N):
-            return self.radix2.compute_dft(signal)
+            return self.radix2._recursive_radix2_logic(x, inverse, scale)
 
         factors = self._factorize(N)
 
         if len(factors) > 1:
-            return self._mixed_radix_fft(x)
+            return self._mixed_radix_fft(x, inverse, scale)
 
-        return self._bluestein_fft(x)
-
-    def compute_idft(self, spectrum):
-        N = len(spectrum)
-        return np.conj(self.compute_dft(DiscreteSignal(np.conj(spectrum)))) / N
+        return self._bluestein_fft(x, inverse, scale)
 
     def _is_power_of_two(self, n):
         return (n & (n - 1)) == 0 and n != 0
@@ -47,8 +52,9 @@ class ArbitraryFFTAnalyzer:
 
     # mixed radix fft
 
-    def _mixed_radix_fft(self, x):
+    def _mixed_radix_fft(self, x, inverse=False, scale=1.0):
         N = len(x)
+        sign = 1.0 if inverse else -1.0
         factors = self._factorize(N)
 
         p = factors[0]   # first prime factor (radix)
@@ -57,8 +63,7 @@ class ArbitraryFFTAnalyzer:
         # Cooley-Tukey decimation requires x[i], x[i+p], x[i+2p], ... for sub-seq i.
         X_blocks = np.zeros((p, m), dtype=np.complex128)
         for i in range(p):
-            sub_signal = DiscreteSignal(x[i::p])   # <-- was x.reshape(p,m)[i]
-            X_blocks[i] = self.compute_dft(sub_signal)
+            X_blocks[i] = self._transform(x[i::p], inverse)   # <-- was x.reshape(p,m)[i]
 
         X = np.zeros(N, dtype=np.complex128)
 
@@ -66,7 +71,8 @@ class ArbitraryFFTAnalyzer:
             value = 0
             for i in range(p):
                 # Twiddle factor: W_N^(i * k)
-                twiddle = np.exp(-2j * np.pi * i * k / N)
+                # (conjugated for the inverse, with the output scale folded in)
+                twiddle = scale * np.exp(sign * 2j * np.pi * i * k / N)
                 value += X_blocks[i][k % m] * twiddle
             X[k] = value
 
@@ -74,19 +80,20 @@ class ArbitraryFFTAnalyzer:
 
     # bluestein's algo
 
-    def _bluestein_fft(self, x):
+    def _bluestein_fft(self, x, inverse=False, scale=1.0):
         N = len(x)
         M = 1
         while M < 2 * N - 1:
             M *= 2
         n = np.arange(N)
+        sign = 1.0 if inverse else -1.0
 
-        # chirp-multiply the input
-        a = x * np.exp(-1j * np.pi * n**2 / N)
+        # chirp-multiply the input (chirp direction flips for the inverse)
+        a = x * np.exp(sign * 1j * np.pi * n**2 / N)
         b = np.zeros(M, dtype=np.complex128)
-        b[:N] = np.exp(1j * np.pi * n**2 / N)
+        b[:N] = np.exp(-sign * 1j * np.pi * n**2 / N)
         # indices M-N+1 .. M-1 should hold exp(+j*pi*k²/N) for k = N-1 .. 1
-        b[M - N + 1:] = np.exp(1j * np.pi * (np.arange(N - 1, 0, -1))**2 / N)
+        b[M - N + 1:] = np.exp(-sign * 1j * np.pi * (np.arange(N - 1, 0, -1))**2 / N)
 
         a_padded = np.zeros(M, dtype=np.complex128)
         a_padded[:N] = a
@@ -96,5 +103,5 @@ class ArbitraryFFTAnalyzer:
         C = A * B
         c = self.radix2.compute_idft(C)
 
-        result = c[:N] * np.exp(-1j * np.pi * n**2 / N)
+        result = c[:N] * (scale * np.exp(sign * 1j * np.pi * n**2 / N))
         return result 
\ No newline at end of file
@@ -68,17 +68,19 @@ class DFTAnalyzer:
         M = np.exp(-2j * np.pi * k * n / N)
         return np.dot(M, x)
 
-    def compute_idft(self, spectrum):
+    def compute_idft(self, spectrum, real_output=False):
         """
         Compute Inverse DFT using naive summation.
+        real_output=True returns only the real part (for Hermitian spectra).
         Returns: numpy array (time-domain samples).
         """
         # TODO: Implement Naive IDFT equation
         N = len(spectrum)
         n = np.arange(N)
         k = n.reshape((N, 1))
-        M = np.exp(2j * np.pi * k * n / N)
-        return np.dot(M, spectrum) / N
+        M = np.exp(2j * np.pi * k * n / N) / N
+        x = np.dot(M, spectrum)
+        return np.real(x) if real_output else x
 
 
 class FastFourierTransform(DFTAnalyzer):
@@ -93,17 +95,20 @@ class FastFourierTransform(DFTAnalyzer):
             raise ValueError("Signal length must be a power of 2 for this algorithm.")
         return self._recursive_radix2_logic(x)
 
-    def _recursive_radix2_logic(self, x):
+    def _recursive_radix2_logic(self, x, inverse=False, scale=1.0):
         """ "
         custom manual implementatoopn of the cooley-tukey recursion.
+        inverse=True uses the conjugate twiddles exp(+2j*pi*k/N) and scale is
+        applied in the last (outermost) butterfly only, so the IFFT needs no
+        conjugate passes and no separate division by N.
         """
         N = len(x)
         if N <= 1:
-            return x
+            return x * scale if scale != 1.0 else x
 
         # splitting into even and odd indices
-        even = self._recursive_radix2_logic(x[0::2])
-        odd = self._recursive_radix2_logic(x[1::2])
+        even = self._recursive_radix2_logic(x[0::2], inverse)
+        odd = self._recursive_radix2_logic(x[1::2], inverse)
         # combine using the butterfly mathematical formula
         # X[k] = E[k]+exp(-2j*pi*k/N)*O[k]
         combined = np.zeros(N, dtype=np.complex128)
@@ -113,14 +118,20 @@ class FastFourierTransform(DFTAnalyzer):
             combined[k + N // 2] = even[k] - rotator_factor
         return combined"""
         k = np.arange(N//2)
-        twiddles = np.exp(-2j * np.pi * k / N) * odd
+        sign = 1.0 if inverse else -1.0
+        twiddles = np.exp(sign * 2j * np.pi * k / N) * odd
+        if scale != 1.0:
+            twiddles *= scale
+            even = even * scale
         combined[:N // 2] = even + twiddles
         combined[N // 2:] = even - twiddles
         return combined
 
 
-    def compute_idft(self, spectrum):
+    def compute_idft(self, spectrum, real_output=False):
+        spectrum = np.asarray(spectrum, dtype=np.complex128)
         N = len(spectrum)
-        spectrum_conj = np.conj(spectrum)
-        transformed = self._recursive_radix2_logic(spectrum_conj)
-        return np.conj(transformed) / N
\ No newline at end of file
+        if (N & (N - 1)) != 0:
+            raise ValueError("Signal length must be a power of 2 for this algorithm.")
+        x = self._recursive_radix2_logic(spectrum, inverse=True, scale=1.0 / N)
+        return np.real(x) if real_output else x
\ No newline at end of file
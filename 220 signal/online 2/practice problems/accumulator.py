@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from convolution_utils import SparseSignal, sparse_convolve
 
 class Signal:
     def __init__(self, INF):
@@ -42,35 +43,194 @@ class Signal:
         plt.show()
 
 
+class RecursiveFilter:
+    """
+    y = (B/A) x as a difference equation, sum_k a[k] y[n-k] = sum_k b[k] x[n-k],
+    run in direct form II: w[n] = x[n] - sum_{k>=1} a[k] w[n-k], y[n] = sum_k b[k] w[n-k].
+    O(N) per block. process() carries the w history between calls, so a long input
+    can be fed block by block.
+
+    First-order denominators (a = [1, -r], accumulators and geometric decays) are
+    solved with blockwise cumulative sums. Higher orders are factored by their poles,
+    1/A(z) = prod_k 1/(1 - q_k z^-1), and run as a cascade of such first-order
+    sections (complex for conjugate pairs). If the computed poles do not reproduce a
+    to round-off, a per-sample loop is used instead. Only the non-zero taps of b are
+    applied, so a long but sparse numerator such as [1, 0, ..., 0, -r^L] costs two
+    vector adds.
+    """
+    def __init__(self, b, a):
+        a = np.atleast_1d(np.asarray(a, dtype=np.float64))
+        b = np.atleast_1d(np.asarray(b, dtype=np.float64))
+        if a[0] == 0:
+            raise ValueError("a[0] must be non-zero")
+        self.b = b / a[0]
+        self.a = a / a[0]
+        self.taps = np.flatnonzero(self.b)
+        self.M = max(len(self.a), len(self.b)) - 1
+        self.poles = None
+        if len(self.a) > 2:
+            q = np.roots(self.a)
+            if np.allclose(np.poly(q), self.a, rtol=0, atol=1e-12 * np.max(np.abs(self.a))):
+                self.poles = q
+        self.reset()
+
+    def reset(self):
+        self._w_hist = np.zeros(self.M)
+
+    def _first_order(self, x, r, w_prev):
+        # w[j] = r^(j+1) w_prev + sum_{m<=j} r^(j-m) x[m]. The input is cut into blocks of
+        # K samples with |r|^-K kept below 1e4 so the scaled cumsum stays accurate, and
+        # every block is solved at once from a zero state. The block ends are then chained
+        # by c_b = e_b + r^K c_{b-1}; with |r^K| ~ 1e-4 a few shifted adds replace that loop.
+        n = len(x)
+        if r == 0:
+            return x.copy()
+        K = n if abs(r) == 1 else max(1, int(np.log(1e4) / abs(np.log(abs(r)))))
+        K = max(1, min(K, n))
+        nb = -(-n // K)
+        p = r ** np.arange(K)
+        X = np.zeros((nb, K), dtype=np.result_type(x, p))
+        X.reshape(-1)[:n] = x
+        local = p * np.cumsum(X / p, axis=1)
+
+        R = r ** K
+        e = local[:, -1]
+        if abs(R) < 1:
+            J = nb if R == 0 else min(nb, int(np.ceil(np.log(1e-18) / np.log(abs(R)))) + 1)
+            c = e.copy()
+            Rj = 1.0
+            for j in range(1, J):
+                Rj *= R
+                c[j:] += Rj * e[:-j]
+            c += R ** np.arange(1, nb + 1) * w_prev
+        else:
+            c = np.empty_like(e)
+            prev = w_prev
+            for b in range(nb):
+                c[b] = prev = e[b] + R * prev
+        carry = np.concatenate([[w_prev], c[:-1]])
+        return (local + (r * p) * carry[:, None]).reshape(-1)[:n]
+
+    def _cascade(self, x, p):
+        # Section k: u_k[n] = u_{k-1}[n] + q_k u_k[n-1], u_0 = x, u_p = w. Its state
+        # u_k[-1] comes from the carried w history, u_{k-1}[n] = u_k[n] - q_k u_k[n-1].
+        q = self.poles
+        H = self._w_hist[-p:].astype(np.complex128)
+        states = [0j] * p
+        for k in range(p - 1, -1, -1):
+            states[k] = H[-1]
+            H = H[1:] - q[k] * H[:-1]
+        v = x.astype(np.complex128)
+        for k in range(p):
+            v = self._first_order(v, q[k], states[k])
+        return v.real
+
+    def process(self, x):
+        x = np.asarray(x, dtype=np.float64).ravel()
+        M, n = self.M, len(x)
+        if n == 0:
+            return np.zeros(0)
+        p = len(self.a) - 1
+        if p == 0:
+            w = x.copy()
+        elif p == 1:
+            w = self._first_order(x, -self.a[1], self._w_hist[-1] if M else 0.0)
+        elif self.poles is not None:
+            w = self._cascade(x, p)
+        else:
+            ext = np.concatenate([self._w_hist, np.zeros(n)])
+            for i in range(n):
+                j = M + i
+                ext[j] = x[i] - np.dot(self.a[1:], ext[j - p:j][::-1])
+            w = ext[M:]
+
+        ext = np.concatenate([self._w_hist, w])
+        y = np.zeros(n)
+        for k in self.taps:
+            y += self.b[k] * ext[M - k:M - k + n]
+        if M:
+            self._w_hist = ext[-M:]
+        return y
+
+# Shortest geometric run worth converting; shorter h are cheaper as plain FIR.
+MIN_RECURSIVE_TAPS = 3
+
+def recursive_form(h: Signal):
+    """
+    (b, a, n0) if h is a finite geometric run c*r^i on n0 <= n < n0+L with |r| <= 1
+    (r = 1 is a step), else None. Such an h equals c*(1 - r^L z^-L)/(1 - r z^-1)
+    delayed by n0, so the recursion reproduces the FIR output exactly. Growing runs
+    (|r| > 1) are left to the FIR path: their pole is unstable and the r^L tap
+    cancels catastrophically.
+    """
+    nz = np.flatnonzero(h.values)
+    if len(nz) < MIN_RECURSIVE_TAPS:
+        return None
+    seg = h.values[nz[0]:nz[-1] + 1]
+    L = len(seg)
+    if L < MIN_RECURSIVE_TAPS:
+        return None
+    r = seg[1] / seg[0]
+    if abs(r) > 1:
+        return None
+    if not np.allclose(seg, seg[0] * r ** np.arange(L), rtol=1e-12, atol=0):
+        return None
+    b = np.zeros(L + 1)
+    b[0] = seg[0]
+    b[L] = -seg[0] * r ** L
+    return b, np.array([1.0, -r]), nz[0] - h.INF
+
+
 class LTI_System:
-    def __init__(self, impulse_response: Signal):
+    def __init__(self, impulse_response: Signal, recursive=None):
         self.h=impulse_response
         self.INF=impulse_response.INF
+        # (b, a, delay) of an equivalent difference equation; step / geometric
+        # responses are detected and run as a first-order recursion
+        self.recursive = recursive if recursive is not None else recursive_form(impulse_response)
+
+    @classmethod
+    def from_difference_equation(cls, b, a, INF=20):
+        """
+        System defined by sum a[k] y[n-k] = sum b[k] x[n-k]; h is its causal impulse
+        response on [0, INF] (INF defaults to the window solve_accumulator_problem uses).
+        """
+        h = Signal(INF)
+        delta = np.zeros(INF + 1)
+        delta[0] = 1.0
+        h.values[INF:] = RecursiveFilter(b, a).process(delta)
+        return cls(h, recursive=(np.asarray(b, dtype=np.float64), np.asarray(a, dtype=np.float64), 0))
         
     def linear_combination_of_impulses(self, input_signal:Signal):
-        impulses = []
-        coefficients = []
-
-        for k in input_signal.n:
-            val = input_signal.values[input_signal._index(k)]
-            if val != 0:
-                delta = Signal(self.INF)
-                delta.set_value_at_time(0,1)
-                delta_k = delta.shift(k)
-                impulses.append(delta_k)
-                coefficients.append(val)
-
+        # one-sample SparseSignal per impulse instead of a full 2*INF+1 Signal
+        x = SparseSignal.from_signal(input_signal)
+        impulses = [SparseSignal(self.INF, [k], [1.0]) for k in x.times]
+        coefficients = list(x.values)
         return impulses, coefficients
     
-    def output(self, input_signal:Signal):
-        impulses, coefficients = self.linear_combination_of_impulses(input_signal)
-        y = Signal(self.INF)
-        for delta_k, coeff in zip(impulses, coefficients):
-            shifted_h = self.h.shift(delta_k.n[np.argmax(delta_k.values)])
-            y=y.add(shifted_h.multiply(coeff))
+    def _output_recursive(self, input_signal:Signal):
+        b, a, n0 = self.recursive
+        x = input_signal.values
+        # z[i] is y at time -input.INF + n0 + i; run long enough to reach t = +INF
+        extra = self.INF - n0 + input_signal.INF + 1 - len(x)
+        if extra > 0:
+            x = np.concatenate([x, np.zeros(extra)])
+        z = RecursiveFilter(b, a).process(x)
 
+        y = Signal(self.INF)
+        j0 = -input_signal.INF + n0 + self.INF
+        lo, up = max(j0, 0), min(j0 + len(z), len(y.values))
+        if lo < up:
+            y.values[lo:up] = z[lo - j0:up - j0]
         return y
 
+    def output(self, input_signal:Signal):
+        if self.recursive is not None:
+            return self._output_recursive(input_signal)
+        # sum_k x[k] h[n-k] over the non-zeros of x only, returned dense like the recursive path
+        x = SparseSignal.from_signal(input_signal)
+        return sparse_convolve(x, self.h, self.INF).to_signal(Signal)
+
 def solve_accumulator_problem(INF=20):
     # Input: Constant signal of 1 for n=0 to n=10
     x = Signal(INF)
@@ -0,0 +1,255 @@
+"""
+Convolution kernels shared by the practice-problem LTI scripts and the offline convolution scripts.
+"""
+import numpy as np
+
+# Below this many samples np.convolve (direct) beats the FFT.
+FFT_CONV_THRESHOLD = 64
+
+# Rows per worker task in convolve_window_batch; smaller batches run inline.
+BATCH_CHUNK_ROWS = 256
+
+def convolve_arrays(x, h):
+    """Full linear convolution of two 1-D arrays: direct for short inputs, FFT otherwise."""
+    if min(len(x), len(h)) <= FFT_CONV_THRESHOLD:
+        return np.convolve(x, h)
+    L = len(x) + len(h) - 1
+    nfft = 1 << (L - 1).bit_length()
+    return np.fft.irfft(np.fft.rfft(x, nfft) * np.fft.rfft(h, nfft), nfft)[:L]
+
+def nonzero_support(values):
+    """(first non-zero index, values trimmed to the non-zero span)."""
+    nz = np.flatnonzero(values)
+    if len(nz) == 0:
+        return 0, values[:0]
+    return nz[0], values[nz[0]:nz[-1] + 1]
+
+def convolve_rows(X, h):
+    """
+    Full linear convolution of every row of the 2-D array X with h, shape
+    (rows, X.shape[1] + len(h) - 1). The shorter operand is applied as shifted adds
+    over all rows at once when it is short, otherwise h is transformed once and
+    reused for every row.
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    h = np.asarray(h, dtype=np.float64)
+    n, m = X.shape[1], len(h)
+    L = n + m - 1
+    if m <= FFT_CONV_THRESHOLD:
+        out = np.zeros((X.shape[0], L))
+        for k in np.flatnonzero(h):
+            out[:, k:k + n] += h[k] * X
+        return out
+    if n <= FFT_CONV_THRESHOLD:
+        out = np.zeros((X.shape[0], L))
+        for j in range(n):
+            out[:, j:j + m] += X[:, j:j + 1] * h
+        return out
+    nfft = 1 << (L - 1).bit_length()
+    return np.fft.irfft(np.fft.rfft(X, nfft, axis=1) * np.fft.rfft(h, nfft), nfft, axis=1)[:, :L]
+
+class SparseSignal:
+    """
+    Mostly-zero signal on the same [-INF, INF] grid as a Signal, stored as two
+    compact sorted arrays (times, values) holding only the non-zero samples.
+    Memory and convolution cost scale with the number of non-zeros, not INF.
+    """
+    def __init__(self, INF, times=(), values=()):
+        self.INF = INF
+        t = np.asarray(times, dtype=np.int64).ravel()
+        v = np.asarray(values, dtype=np.float64).ravel()
+        # repeated times are summed; zeros and samples outside the window are dropped
+        t, inv = np.unique(t, return_inverse=True)
+        v = np.bincount(inv.ravel(), weights=v, minlength=len(t))
+        keep = (v != 0) & (np.abs(t) <= INF)
+        self.times = t[keep]
+        self.values = v[keep]
+
+    @classmethod
+    def from_signal(cls, sig):
+        idx = np.flatnonzero(sig.values)
+        return cls(sig.INF, idx - sig.INF, sig.values[idx])
+
+    def to_signal(self, signal_cls):
+        """Dense copy as a signal_cls(INF), the calling script's Signal class."""
+        sig = signal_cls(self.INF)
+        sig.values[self.times + self.INF] = self.values
+        return sig
+
+    def nnz(self):
+        return len(self.times)
+
+    def set_value_at_time(self, time, value):
+        if -self.INF <= time <= self.INF:
+            i = np.searchsorted(self.times, time)
+            if i < len(self.times) and self.times[i] == time:
+                if value != 0:
+                    self.values[i] = value
+                else:
+                    self.times = np.delete(self.times, i)
+                    self.values = np.delete(self.values, i)
+            elif value != 0:
+                self.times = np.insert(self.times, i, time)
+                self.values = np.insert(self.values, i, value)
+
+    def get_value_at_time(self, time):
+        i = np.searchsorted(self.times, time)
+        if i < len(self.times) and self.times[i] == time:
+            return self.values[i]
+        return 0
+
+def sparse_convolve(x: SparseSignal, h, INF):
+    """
+    y = x * h for sparse x and any h (Signal or SparseSignal), returned sparse and
+    truncated to [-INF, INF]. Every non-zero x[k] scatters x[k]*h[n-k] over the
+    non-zeros of h: O(nnz(x) * nnz(h)) work (a dense h is scanned once).
+    """
+    if not isinstance(h, SparseSignal):
+        h = SparseSignal.from_signal(h)
+    if x.nnz() == 0 or h.nnz() == 0:
+        return SparseSignal(INF)
+    t = (x.times[:, None] + h.times[None, :]).ravel()
+    v = (x.values[:, None] * h.values[None, :]).ravel()
+    return SparseSignal(INF, t, v)
+
+def superpose_outputs(h, components):
+    """
+    sum_i c_i (x_i * h) on [-INF, INF] for SuperSignal components (c_i, x_i) that share
+    one INF, or None when their windows differ. Dense components are stacked into a
+    (components x samples) matrix, convolved with h in one convolve_rows call and
+    reduced with the coefficient vector. A SparseSignal component is scattered as the
+    outer product of its samples with the non-zeros of h.
+    """
+    inf = components[0][1].INF
+    if any(x_i.INF != inf for _, x_i in components):
+        return None
+    coeffs = np.array([coeff for coeff, _ in components], dtype=np.float64)
+    sparse = np.array([isinstance(x_i, SparseSignal) for _, x_i in components])
+
+    y = np.zeros(2 * inf + 1)
+    if not sparse.all():
+        X = np.stack([x_i.values for (_, x_i), s in zip(components, sparse) if not s])
+        full = convolve_rows(X, h.values)
+        # full[:, j] is time -inf - h.INF + j; keep the window [-inf, inf]
+        y += coeffs[~sparse] @ full[:, h.INF:h.INF + 2 * inf + 1]
+    if sparse.any():
+        h_times = np.flatnonzero(h.values) - h.INF
+        h_vals = h.values[h_times + h.INF]
+        times = np.concatenate([x_i.times for (_, x_i), s in zip(components, sparse) if s])
+        weights = np.concatenate([coeff * x_i.values for (coeff, x_i), s in zip(components, sparse) if s])
+        t = (times[:, None] + h_times[None, :]).ravel()
+        v = (weights[:, None] * h_vals[None, :]).ravel()
+        keep = np.abs(t) <= inf
+        y += np.bincount(t[keep] + inf, weights=v[keep], minlength=2 * inf + 1)
+    return y
+
+def convolve_window_batch(h, X, workers=None, use_processes=False):
+    """
+    Outputs for many inputs through one h (a Signal on [-h.INF, h.INF]). Row i of X
+    holds x_i on [-inf, inf] (inf = (X.shape[1] - 1) // 2), and row i of the result is
+    x_i * h on the same window. h is trimmed to its support and transformed once. A
+    short support is applied as shifted adds of its non-zero taps, a long one by FFT
+    against the shared spectrum. Batches larger than BATCH_CHUNK_ROWS are split across a thread pool, or
+    a process pool if use_processes is True.
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    n = X.shape[1]
+    nz = np.flatnonzero(h.values)
+    if len(nz) == 0 or n == 0:
+        return np.zeros(X.shape)
+    seg = h.values[nz[0]:nz[-1] + 1]
+    d0 = nz[0] - h.INF
+
+    if len(seg) <= FFT_CONV_THRESHOLD:
+        out = np.zeros(X.shape)
+        for j in np.flatnonzero(seg):
+            d = d0 + j
+            if abs(d) >= n:
+                continue
+            if d >= 0:
+                out[:, d:] += seg[j] * X[:, :n - d]
+            else:
+                out[:, :n + d] += seg[j] * X[:, -d:]
+        return out
+
+    nfft = 1 << (n + len(seg) - 2).bit_length()
+    H = np.fft.rfft(seg, nfft)
+    if X.shape[0] <= BATCH_CHUNK_ROWS:
+        return fft_convolve_rows(X, H, nfft, d0)
+
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+    chunks = [X[i:i + BATCH_CHUNK_ROWS] for i in range(0, X.shape[0], BATCH_CHUNK_ROWS)]
+    pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool(max_workers=workers) as ex:
+        parts = list(ex.map(fft_convolve_rows, chunks, [H] * len(chunks),
+                            [nfft] * len(chunks), [d0] * len(chunks)))
+    return np.vstack(parts)
+
+def fft_convolve_rows(X, H, nfft, d0):
+    """Convolve every row of X with the h whose spectrum is H (first tap at delay d0), keeping X's window."""
+    n = X.shape[1]
+    F = np.fft.irfft(np.fft.rfft(X, nfft, axis=1) * H, nfft, axis=1)
+    out = np.zeros(X.shape)
+    lo, hi = max(d0, 0), min(n, d0 + nfft)
+    out[:, lo:hi] = F[:, lo - d0:hi - d0]
+    return out
+
+class StreamingSmoother:
+    """
+    Causal FIR smoother y[n] = sum_k w[k] x[n-k] over an unbounded stream. Feed blocks
+    to process(), or an iterator of blocks to stream(). Only the last len(w) input
+    samples are kept between calls, so memory does not grow with the stream.
+
+    Constant weights (a boxcar) update a running window sum by x[n] - x[n-L], which is
+    O(1) per sample. The sum is carried across SEGMENT-sample runs with Kahan
+    compensation, so it does not drift over long logs. Other weights are convolved
+    blockwise against the carried history.
+    """
+    SEGMENT = 1024
+
+    def __init__(self, weights):
+        w = np.atleast_1d(np.asarray(weights, dtype=np.float64))
+        if len(w) == 0:
+            raise ValueError("weights must be non-empty")
+        self.weights = w
+        self.L = len(w)
+        self.is_boxcar = bool(np.all(w == w[0]))
+        self.reset()
+
+    @classmethod
+    def boxcar(cls, L):
+        return cls(np.full(L, 1.0 / L))
+
+    def reset(self):
+        self._hist = np.zeros(self.L)   # x[-L] .. x[-1]
+        self._sum = 0.0                 # sum of the current window
+        self._comp = 0.0                # Kahan compensation for _sum
+
+    def _kahan_add(self, v):
+        y = v - self._comp
+        t = self._sum + y
+        self._comp = (t - self._sum) - y
+        self._sum = t
+
+    def process(self, block):
+        x = np.asarray(block, dtype=np.float64).ravel()
+        n, L = len(x), self.L
+        if n == 0:
+            return np.zeros(0)
+        ext = np.concatenate([self._hist, x])   # ext[j + L] is x[j]
+        self._hist = ext[-L:]
+
+        if not self.is_boxcar:
+            return convolve_arrays(ext[1:], self.weights)[L - 1:L - 1 + n]
+
+        d = ext[L:] - ext[:n]                   # x[j] - x[j-L]
+        out = np.empty(n)
+        for s in range(0, n, self.SEGMENT):
+            seg = d[s:s + self.SEGMENT]
+            out[s:s + len(seg)] = (self._sum - self._comp) + np.cumsum(seg)
+            self._kahan_add(np.sum(seg))
+        return self.weights[0] * out
+
+    def stream(self, blocks):
+        for block in blocks:
+            yield self.process(block)
@@ -13,6 +13,11 @@ class Signal:
     def set_value_at_time(self, t, value):
         if -self.INF<=t<=self.INF:
             self.values[self._index(t)]=value
+
+    def get_value_at_time(self, t):
+        if -self.INF<=t<=self.INF:
+            return self.values[self._index(t)]
+        return 0
     
     def shift(self, k):
         shifted = Signal(self.INF)
@@ -71,6 +76,112 @@ class LTI_System:
 
         return y
 
+# ---------------------------------------------------------------------------
+# 2-D extension: the same difference idea as an image kernel
+# ---------------------------------------------------------------------------
+
+SOBEL_X = np.array([[1, 0, -1], [2, 0, -2], [1, 0, -1]], dtype=np.float64)
+SOBEL_Y = SOBEL_X.T.copy()
+PREWITT_X = np.array([[1, 0, -1], [1, 0, -1], [1, 0, -1]], dtype=np.float64)
+PREWITT_Y = PREWITT_X.T.copy()
+LAPLACIAN = np.array([[0, 1, 0], [1, -4, 1], [0, 1, 0]], dtype=np.float64)
+
+EDGE_KERNELS = {
+    "sobel": (SOBEL_X, SOBEL_Y),
+    "prewitt": (PREWITT_X, PREWITT_Y),
+    "laplacian": (LAPLACIAN,),
+}
+
+# Kernels with at most this many taps (per 1-D pass, or in total for a 2-D kernel)
+# are applied as shifted adds. Larger ones go through the FFT.
+DIRECT_MAX_TAPS = 49
+
+def separable_factors(kernel, tol=1e-10):
+    """(column, row) with kernel == outer(column, row) if the kernel is rank 1 (by SVD), else None."""
+    kernel = np.asarray(kernel, dtype=np.float64)
+    if kernel.ndim != 2:
+        return None
+    u, s, vt = np.linalg.svd(kernel)
+    if s[0] == 0 or (len(s) > 1 and s[1] > tol * s[0]):
+        return None
+    return u[:, 0] * np.sqrt(s[0]), vt[0] * np.sqrt(s[0])
+
+def _valid_1d(a, taps, axis):
+    """'valid' convolution of a with taps along axis: out[i] = sum_k taps[k] a[i + K-1 - k]."""
+    K, N = len(taps), a.shape[axis]
+    n_out = N - K + 1
+    if K > DIRECT_MAX_TAPS:
+        # circular convolution of length N: indices K-1.. are the linear (valid) ones
+        F = np.fft.rfft(a, axis=axis) * np.fft.rfft(taps, N).reshape([-1 if d == axis else 1 for d in range(a.ndim)])
+        return np.take(np.fft.irfft(F, N, axis=axis), np.arange(K - 1, N), axis=axis)
+    out = np.zeros(a.shape[:axis] + (n_out,) + a.shape[axis + 1:])
+    for k in np.flatnonzero(taps):
+        idx = [slice(None)] * a.ndim
+        idx[axis] = slice(K - 1 - k, K - 1 - k + n_out)
+        out += taps[k] * a[tuple(idx)]
+    return out
+
+def _valid_2d(block, kernel, factors):
+    kh, kw = kernel.shape
+    if factors is not None:
+        return _valid_1d(_valid_1d(block, factors[0], 0), factors[1], 1)
+    H, W = block.shape
+    if kernel.size > DIRECT_MAX_TAPS:
+        circ = np.fft.irfft2(np.fft.rfft2(block) * np.fft.rfft2(kernel, (H, W)), (H, W))
+        return circ[kh - 1:, kw - 1:]
+    out = np.zeros((H - kh + 1, W - kw + 1))
+    for a, b in zip(*np.nonzero(kernel)):
+        out += kernel[a, b] * block[kh - 1 - a:H - a, kw - 1 - b:W - b]
+    return out
+
+def convolve2d(image, kernel, mode="same", tile=512, workers=None):
+    """
+    2-D linear convolution of image with kernel, zero outside the image. mode="full" gives
+    the (H+kh-1, W+kw-1) result, and "same" gives the H x W part centred on the kernel.
+    A rank-1 kernel runs as a column pass and then a row pass. Kernels with up to
+    DIRECT_MAX_TAPS taps are applied as shifted adds, and larger ones by FFT. The output
+    is cut into tile x tile pieces, each computed from its own haloed input block,
+    and the pieces run on a thread pool when there is more than one.
+    """
+    image = np.asarray(image, dtype=np.float64)
+    kernel = np.asarray(kernel, dtype=np.float64)
+    H, W = image.shape
+    kh, kw = kernel.shape
+    factors = separable_factors(kernel)
+
+    # full[i, j] = sum k[a, b] Xp[i + kh-1 - a, j + kw-1 - b] on the zero-padded image
+    Xp = np.pad(image, ((kh - 1, kh - 1), (kw - 1, kw - 1)))
+    if mode == "full":
+        r_off, c_off, Ho, Wo = 0, 0, H + kh - 1, W + kw - 1
+    elif mode == "same":
+        r_off, c_off, Ho, Wo = (kh - 1) // 2, (kw - 1) // 2, H, W
+    else:
+        raise ValueError("mode must be 'full' or 'same'")
+
+    out = np.empty((Ho, Wo))
+    tiles = [(r, c) for r in range(0, Ho, tile) for c in range(0, Wo, tile)]
+
+    def run(rc):
+        r, c = rc
+        r1, c1 = min(r + tile, Ho), min(c + tile, Wo)
+        block = Xp[r_off + r:r_off + r1 + kh - 1, c_off + c:c_off + c1 + kw - 1]
+        out[r:r1, c:c1] = _valid_2d(block, kernel, factors)
+
+    if len(tiles) == 1:
+        run(tiles[0])
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(run, tiles))
+    return out
+
+def detect_edges(image, method="sobel", **kwargs):
+    """Edge strength: gradient magnitude for sobel/prewitt, |response| for laplacian."""
+    responses = [convolve2d(image, k, **kwargs) for k in EDGE_KERNELS[method]]
+    if len(responses) == 1:
+        return np.abs(responses[0])
+    return np.hypot(*responses)
+
 # PROBLEM: Edge Detection / First Difference
 # A system that detects changes in a signal.
 
@@ -97,5 +208,26 @@ def solve_edge_detection():
 # Expected: y[2] = 5, all other y[n] = 0. 
 # The system "ignored" the constant values and only reacted to the jump at n=2.
 
+def solve_image_edge_detection(image=None):
+    # Default test image: a bright square and a disk on a dark background.
+    # Any grayscale array (e.g. from plt.imread) works the same way.
+    if image is None:
+        yy, xx = np.mgrid[0:256, 0:256]
+        image = np.zeros((256, 256))
+        image[40:120, 40:120] = 1.0
+        image[(yy - 170) ** 2 + (xx - 170) ** 2 < 50 ** 2] = 0.6
+    elif image.ndim == 3:
+        image = image[..., :3].mean(axis=2)
+
+    plt.figure(figsize=(12, 3))
+    panels = [("Input", image)] + [(m.title(), detect_edges(image, m)) for m in EDGE_KERNELS]
+    for i, (title, img) in enumerate(panels):
+        plt.subplot(1, len(panels), i + 1)
+        plt.imshow(img, cmap="gray")
+        plt.title(title)
+        plt.axis("off")
+    plt.show()
+
 if __name__=="__main__":
-    solve_edge_detection()
\ No newline at end of file
+    solve_edge_detection()
+    solve_image_edge_detection()
\ No newline at end of file
@@ -1,5 +1,7 @@
+import time
 import numpy as np
 import matplotlib.pyplot as plt
+from convolution_utils import convolve_window_batch, SparseSignal, sparse_convolve
 
 class Signal:
     def __init__(self, INF):
@@ -48,28 +50,141 @@ class LTI_System:
         self.INF=impulse_response.INF
         
     def linear_combination_of_impulses(self, input_signal:Signal):
-        impulses = []
-        coefficients = []
-
-        for k in input_signal.n:
-            val = input_signal.values[input_signal._index(k)]
-            if val != 0:
-                delta = Signal(self.INF)
-                delta.set_value_at_time(0,1)
-                delta_k = delta.shift(k)
-                impulses.append(delta_k)
-                coefficients.append(val)
-
+        # one-sample SparseSignal per impulse instead of a full 2*INF+1 Signal
+        x = SparseSignal.from_signal(input_signal)
+        impulses = [SparseSignal(self.INF, [k], [1.0]) for k in x.times]
+        coefficients = list(x.values)
         return impulses, coefficients
     
     def output(self, input_signal:Signal):
-        impulses, coefficients = self.linear_combination_of_impulses(input_signal)
-        y = Signal(self.INF)
-        for delta_k, coeff in zip(impulses, coefficients):
-            shifted_h = self.h.shift(delta_k.n[np.argmax(delta_k.values)])
-            y=y.add(shifted_h.multiply(coeff))
+        # bit streams are impulse trains: convolve only their non-zeros with h
+        if not isinstance(input_signal, SparseSignal):
+            input_signal = SparseSignal.from_signal(input_signal)
+        return sparse_convolve(input_signal, self.h, self.INF).to_signal(Signal)
+
+    def output_batch(self, X, workers=None, use_processes=False):
+        """output(x_i) for every row x_i of X at once; see convolve_window_batch."""
+        return convolve_window_batch(self.h, X, workers, use_processes)
+
+def _taps_system(taps):
+    """LTI_System whose h has taps[k] at n = k."""
+    taps = np.asarray(taps, dtype=np.float64)
+    h = Signal(len(taps))
+    h.values[h.INF:h.INF + len(taps)] = taps
+    return LTI_System(h)
+
+def zero_forcing_equalizer(channel_taps, n_taps=11, delay=None):
+    """
+    Least-squares zero-forcing FIR equalizer e (n_taps long) with channel * e ~ delta[n - delay].
+    Returns (taps, delay). By default delay is the channel's main cursor plus n_taps // 2.
+    """
+    h = np.asarray(channel_taps, dtype=np.float64)
+    L = len(h) + n_taps - 1
+    if delay is None:
+        delay = int(np.argmax(np.abs(h))) + n_taps // 2
+    C = np.zeros((L, n_taps))
+    for k in range(n_taps):
+        C[k:k + len(h), k] = h
+    target = np.zeros(L)
+    target[delay] = 1.0
+    return np.linalg.lstsq(C, target, rcond=None)[0], delay
+
+# Frames (rows) generated and convolved together by the BER simulator.
+BER_FRAMES_PER_BATCH = 64
+
+def _ber_job(channel_taps, eq_taps, delay, spacing, snr_db, n_bits, frame_bits, seed):
+    """Errors in n_bits random antipodal bits at one SNR, run as frames_x_samples batches."""
+    rng = np.random.default_rng(seed)
+    h = np.asarray(channel_taps, dtype=np.float64)
+    channel = _taps_system(h)
+    equalizer = _taps_system(eq_taps) if eq_taps is not None else None
+    # Eb/N0 against the received energy per bit, sum(h^2)
+    sigma = np.sqrt(np.sum(h ** 2) / (2 * 10 ** (snr_db / 10)))
+    sign = 1.0 if equalizer is not None or h[delay] >= 0 else -1.0
+    tail = len(h) + (len(eq_taps) if eq_taps is not None else 0)
+
+    errors, done = 0, 0
+    while done < n_bits:
+        frames = max(1, min(BER_FRAMES_PER_BATCH, -(-(n_bits - done) // frame_bits)))
+        bits = rng.integers(0, 2, (frames, frame_bits))
+        X = np.zeros((frames, frame_bits * spacing + tail))
+        X[:, :frame_bits * spacing:spacing] = 2.0 * bits - 1.0
+        Y = channel.output_batch(X)
+        Y += sigma * rng.standard_normal(Y.shape)
+        if equalizer is not None:
+            Y = equalizer.output_batch(Y)
+        decided = sign * Y[:, delay:delay + frame_bits * spacing:spacing] > 0
+        count = min(frames * frame_bits, n_bits - done)
+        errors += int(np.count_nonzero((decided != bits).ravel()[:count]))
+        done += count
+    return errors, done
 
-        return y
+class BERSimulator:
+    """
+    Monte-Carlo bit error rate of antipodal (+1/-1) bits sent every `spacing` samples
+    through the FIR channel `channel_taps` with additive white Gaussian noise. Bits are
+    drawn in frames of frame_bits, and a batch of frames is convolved at once with
+    LTI_System.output_batch. Each bit is decided by the sign at its main-cursor sample,
+    or after the FIR `equalizer` (taps, delay) if one is given. Work is split into jobs
+    per SNR, and each job gets its own child of SeedSequence(seed) as its RNG stream.
+    """
+    def __init__(self, channel_taps, spacing=1, equalizer=None, frame_bits=4096):
+        self.channel_taps = np.asarray(channel_taps, dtype=np.float64)
+        self.spacing = spacing
+        self.frame_bits = frame_bits
+        if equalizer is None:
+            self.eq_taps, self.delay = None, int(np.argmax(np.abs(self.channel_taps)))
+        else:
+            self.eq_taps, self.delay = np.asarray(equalizer[0], dtype=np.float64), equalizer[1]
+
+    def run(self, snr_db, n_bits=10**6, workers=None, jobs_per_snr=4, seed=0):
+        """
+        BER at each SNR (Eb/N0 in dB). Returns a list of dicts with keys snr_db, ber, errors
+        and bits, plus the overall throughput in bits/s. workers=1 runs in-process, and
+        anything else uses a process pool.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        snr_db = [float(v) for v in np.atleast_1d(snr_db)]
+        per_job = -(-n_bits // jobs_per_snr)
+        tasks = []
+        for snr in snr_db:
+            left = n_bits
+            while left > 0:
+                tasks.append((snr, min(per_job, left)))
+                left -= per_job
+        seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+        args = [(self.channel_taps, self.eq_taps, self.delay, self.spacing, snr, nb,
+                 self.frame_bits, sd) for (snr, nb), sd in zip(tasks, seeds)]
+
+        start = time.perf_counter()
+        if workers == 1:
+            counts = [_ber_job(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                counts = list(ex.map(_ber_job, *zip(*args)))
+        elapsed = time.perf_counter() - start
+
+        results = []
+        for snr in snr_db:
+            errors = sum(e for (t, _), (e, _) in zip(tasks, counts) if t == snr)
+            bits = sum(b for (t, _), (_, b) in zip(tasks, counts) if t == snr)
+            results.append({"snr_db": snr, "ber": errors / bits, "errors": errors, "bits": bits})
+        return results, len(snr_db) * n_bits / elapsed
+
+def plot_ber_curves(curves, title="Bit Error Rate"):
+    """curves: {label: results from BERSimulator.run}."""
+    plt.figure()
+    for label, results in curves.items():
+        snr = [r["snr_db"] for r in results]
+        ber = [max(r["ber"], 1e-12) for r in results]
+        plt.semilogy(snr, ber, marker="o", label=label)
+    plt.title(title)
+    plt.xlabel("Eb/N0 (dB)")
+    plt.ylabel("BER")
+    plt.grid(True, which="both")
+    plt.legend()
+    plt.show()
 
 def solve_isi_problem(INF=20):
     # Digital Input Signal: 1, 0, 1, 1
@@ -94,5 +209,23 @@ def solve_isi_problem(INF=20):
 # Observation: The output pulses overlap, making it hard to tell 
 # where one bit ends and the next begins.
 
+def simulate_ber_problem(n_bits=200000):
+    # Same 3-tap channel at bit spacing 1 (every bit overlaps its neighbours),
+    # with and without a zero-forcing equalizer
+    h = [1.0, 0.8, 0.3]
+    snrs = [0, 2, 4, 6, 8, 10]
+    curves = {"ideal channel": BERSimulator([1.0]).run(snrs, n_bits)[0]}
+    raw, rate = BERSimulator(h).run(snrs, n_bits)
+    curves["ISI, threshold"] = raw
+    eq, _ = BERSimulator(h, equalizer=zero_forcing_equalizer(h, 15)).run(snrs, n_bits)
+    curves["ISI, ZF equalizer"] = eq
+
+    print(f"{'Eb/N0':>6} " + " ".join(f"{k:>18}" for k in curves))
+    for i, snr in enumerate(snrs):
+        print(f"{snr:>6} " + " ".join(f"{curves[k][i]['ber']:>18.2e}" for k in curves))
+    print(f"Throughput: {rate:.3e} bits/s")
+    plot_ber_curves(curves, "BER over the 3-tap ISI channel")
+
 if __name__=="__main__":
-    solve_isi_problem()
\ No newline at end of file
+    solve_isi_problem()
+    simulate_ber_problem()
\ No newline at end of file
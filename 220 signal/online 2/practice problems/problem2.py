@@ -12,6 +12,8 @@ for the second."""
 import numpy as np
 import matplotlib.pyplot as plt
 
+from convolution_utils import superpose_outputs, convolve_arrays, FFT_CONV_THRESHOLD
+
 # Todo: Define Signal class
 
 class Signal:
@@ -55,6 +57,12 @@ class LTI_System:
         first_sig = super_signal.components[0][1]
         final_output = Signal(first_sig.INF)
 
+        # one batched convolution when all components share a window
+        values = superpose_outputs(self.h, super_signal.components)
+        if values is not None:
+            final_output.values = values
+            return final_output
+
         for coeff, x_i in super_signal.components:
             y_i = self.output(x_i)
 
@@ -71,6 +79,92 @@ def output_cascade(input_signal, systems_list):
         current_signal = system.output(current_signal)
     return current_signal
 
+class CascadeSystem:
+    """
+    A chain of LTI systems collapsed into one: by associativity
+    (x * h1) * h2 * ... = x * (h1 * h2 * ...), so the composite impulse response is
+    built once and every input costs a single convolution instead of one per stage.
+
+    The composite h is cached and rebuilt when the chain is edited or a member's h
+    (or its values array) is replaced; checking that costs O(stages), not O(len(h)).
+    Call invalidate() after editing a member's h.values in place. Composite responses
+    longer than FFT_CONV_THRESHOLD are combined by multiplying the stage spectra.
+
+    Unlike output_cascade, intermediate results are not clipped to [-INF, INF];
+    the output is the exact cascade restricted to the input's window.
+    """
+    def __init__(self, systems):
+        self.systems = list(systems)
+        self._key = None
+        self._h = None          # (start time, values) of the composite response
+
+    def append(self, system):
+        self.systems.append(system)
+
+    def invalidate(self):
+        """Force a rebuild of the composite h, e.g. after set_value_at_time on a member's h."""
+        self._key = None
+
+    def _is_current(self, key):
+        # the key holds the objects themselves, so a replaced h or values array is
+        # caught by identity (no id() reuse after the old one is freed)
+        return (self._key is not None and len(key) == len(self._key)
+                and all(h is h0 and v is v0 and inf == inf0
+                        for (h, v, inf), (h0, v0, inf0) in zip(key, self._key)))
+
+    def composite_response(self):
+        key = [(system.h, system.h.values, system.h.INF) for system in self.systems]
+        if not self._is_current(key):
+            self._h = self._compose()
+            self._key = key
+        return self._h
+
+    def _compose(self):
+        parts = []
+        for system in self.systems:
+            nz = np.flatnonzero(system.h.values)
+            if len(nz) == 0:
+                return 0, np.zeros(0)
+            parts.append((nz[0] - system.h.INF, system.h.values[nz[0]:nz[-1] + 1]))
+        if not parts:
+            return 0, np.ones(1)     # empty chain = identity
+
+        start = sum(t for t, _ in parts)
+        L = sum(len(v) for _, v in parts) - len(parts) + 1
+        if len(parts) == 1 or L <= FFT_CONV_THRESHOLD:
+            values = parts[0][1].copy()
+            for _, v in parts[1:]:
+                values = convolve_arrays(values, v)
+        else:
+            nfft = 1 << (L - 1).bit_length()
+            spectrum = np.ones(nfft // 2 + 1, dtype=np.complex128)
+            for _, v in parts:
+                spectrum *= np.fft.rfft(v, nfft)
+            values = np.fft.irfft(spectrum, nfft)[:L]
+        return start, values
+
+    def impulse_response(self, INF):
+        start, values = self.composite_response()
+        h = Signal(INF)
+        for i, v in enumerate(values):
+            h.set_value_at_time(start + i, v)
+        return h
+
+    def output(self, x: Signal):
+        start, hv = self.composite_response()
+        result = Signal(x.INF)
+        nz = np.flatnonzero(x.values)
+        if len(nz) == 0 or len(hv) == 0:
+            return result
+        y = convolve_arrays(x.values[nz[0]:nz[-1] + 1], hv)
+
+        # y[i] is time t0 + i; keep what falls inside [-INF, INF]
+        j0 = (nz[0] - x.INF) + start + x.INF
+        lo, up = max(j0, 0), min(j0 + len(y), len(result.values))
+        if lo < up:
+            result.values[lo:up] = y[lo - j0:up - j0]
+        return result
+
 def solve_cascade_problem():
     INF = 10
     
@@ -96,6 +190,11 @@ def solve_cascade_problem():
     for t in range(-1, 3):
         print(f"y[{t}] = {final_y.get_value_at_time(t):.1f}")
 
+    # Same chain with the composite impulse response computed once
+    cascade = CascadeSystem([sys1, sys2])
+    fused_y = cascade.output(x)
+    print("Fused cascade matches:", np.allclose(final_y.values, fused_y.values))
+
 # Expected Logic:
 # x convolved with h1 gives [0.5, 0.5]
 # That result convolved with h2 ([2.0]) gives [1.0, 1.0]
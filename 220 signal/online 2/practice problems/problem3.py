@@ -1,4 +1,5 @@
 import numpy as np
+from convolution_utils import SparseSignal, sparse_convolve, superpose_outputs
 
 """
 PROBLEM STATEMENT: Signal Decomposition & Superposition Verification
@@ -20,6 +21,7 @@ Task:
 5. Verify that both methods produce identical results.
 """
 
+
 class Signal:
     def __init__(self, INF):
         self.INF = INF
@@ -49,6 +51,9 @@ class LTI_System:
 
     def output(self, x: Signal):
         """Method A: Standard Discrete Convolution"""
+        # sparse inputs take the sparse kernel; the result is a dense Signal either way
+        if isinstance(x, SparseSignal):
+            return sparse_convolve(x, self.h, x.INF).to_signal(Signal)
         inf = x.INF
         result = Signal(inf)
         for n in range(-inf, inf + 1):
@@ -61,20 +66,21 @@ class LTI_System:
     def output_super(self, super_signal: SuperSignal):
         """Method B: Superposition (Convolution of components)"""
         # Create an empty signal to accumulate results
-        # We assume all component signals share the same INF
+        # The output lives on the first component's window
         sample_sig = super_signal.components[0][1]
         final_output = Signal(sample_sig.INF)
-        
+        inf = final_output.INF
+
+        # one batched convolution when all components share a window
+        values = superpose_outputs(self.h, super_signal.components)
+        if values is not None:
+            final_output.values = values
+            return final_output
+
         for coeff, x_i in super_signal.components:
-            # Convolve this specific component impulse with h
             y_i = self.output(x_i)
-            
-            # Weighted sum: Accumulate (coeff * y_i) into final_output
-            for n in range(-final_output.INF, final_output.INF + 1):
-                current_total = final_output.get_value_at_time(n)
-                increment = coeff * y_i.get_value_at_time(n)
-                final_output.set_value_at_time(n, current_total + increment)
-        
+            for n in range(-inf, inf + 1):
+                final_output.set_value_at_time(n, final_output.get_value_at_time(n) + coeff * y_i.get_value_at_time(n))
         return final_output
 
 def decompose_to_supersignal(sig: Signal):
@@ -85,14 +91,12 @@ def decompose_to_supersignal(sig: Signal):
     super_sig = SuperSignal()
     inf = sig.INF
     
-    for t in range(-inf, inf + 1):
-        val = sig.get_value_at_time(t)
-        if val != 0:
-            # Create a simple unit impulse delta[n - t]
-            delta_k = Signal(inf)
-            delta_k.set_value_at_time(t, 1.0)
-            # Add it to the SuperSignal with the signal's value as the weight
-            super_sig.add(delta_k, val)
+    for idx in np.flatnonzero(sig.values):
+        t = idx - inf
+        # A unit impulse delta[n - t] needs one stored sample, not 2*INF+1
+        delta_k = SparseSignal(inf, [t], [1.0])
+        # Add it to the SuperSignal with the signal's value as the weight
+        super_sig.add(delta_k, sig.values[idx])
             
     return super_sig
 